@@ -2,9 +2,9 @@ import pygame
 import chess
 import sys
 import os
-import random
 import threading
 import time
+import queue
 
 # --- Constants ---
 # Screen dimensions
@@ -16,6 +16,10 @@ BOARD_WIDTH = 720
 BOARD_HEIGHT = 720
 SQUARE_SIZE = BOARD_WIDTH // 8
 
+FPS = 60 # Upper bound on redraws per second
+# Events that mean the window must be repainted; WINDOWEXPOSED only exists in pygame 2
+EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, getattr(pygame, "WINDOWEXPOSED", pygame.VIDEOEXPOSE))
+
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -25,21 +29,12 @@ HIGHLIGHT_COLOR = (100, 255, 100, 100)
 SELECTED_COLOR = (255, 255, 0, 150)
 
 # --- NEW: AI Configuration ---
-AI_PLAYER = chess.BLACK
-AI_THINK_TIME = 0.5 # Seconds for the AI to "think" to feel more natural
-
-# --- NEW: Piece values for AI evaluation ---
-PIECE_VALUES = {
-    chess.PAWN: 1,
-    chess.KNIGHT: 3,
-    chess.BISHOP: 3,
-    chess.ROOK: 5,
-    chess.QUEEN: 9,
-    chess.KING: 0 # King value is infinite in reality, but 0 for material calculation
-}
+AI_PLAYER = chess.BLACK # Default side for the AI
+AI_THINK_TIME = 0.5 # Seconds the AI spends searching, deepening until time runs out
+MIN_UI_DELAY = 0.5 # Minimum seconds before the AI's move appears, to feel more natural
 
 class ChessGUI:
-    def __init__(self):
+    def __init__(self, enable_ai=True, ai_color=AI_PLAYER):
         pygame.init()
         pygame.mixer.init()
 
@@ -48,6 +43,20 @@ class ChessGUI:
         
         self.board_pos_x = (WIDTH - BOARD_WIDTH) // 2
         self.board_pos_y = (HEIGHT - BOARD_HEIGHT) // 2
+        # Top-left screen position of every square, indexed by square number
+        self._square_xy = tuple((self.board_pos_x + (sq & 7) * SQUARE_SIZE,
+                                 self.board_pos_y + (7 - (sq >> 3)) * SQUARE_SIZE)
+                                for sq in chess.SQUARES)
+
+        self._board_bg = self._build_board_bg()
+
+        # Overlays are drawn once here, converted to the display format, and only blitted each frame
+        self._sel_surface = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA).convert_alpha()
+        self._sel_surface.fill(SELECTED_COLOR)
+        self._dot_surface = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.circle(self._dot_surface, HIGHLIGHT_COLOR, (SQUARE_SIZE//2, SQUARE_SIZE//2), SQUARE_SIZE // 6)
+        self._gameover_overlay = pygame.Surface((BOARD_WIDTH, BOARD_HEIGHT), pygame.SRCALPHA).convert_alpha()
+        self._gameover_overlay.fill((0, 0, 0, 180))
 
         self.board = chess.Board()
         self.piece_images = self.load_piece_images()
@@ -55,7 +64,26 @@ class ChessGUI:
         
         self.selected_square = None
         self.legal_moves = []
-        self.ai_is_thinking = False # --- NEW --- Flag to prevent user moves while AI thinks
+        self._legal_cache = None # Legal moves of the current position, built on demand
+        self._legal_set = set() # The same moves as _legal_cache, for membership tests
+        self._piece_map = self.board.piece_map() # Occupied squares, rebuilt on the main thread after each move
+        self._gameover_cache = None # (outcome, rendered text surfaces and rects) once the game ends
+        self._clock = pygame.time.Clock()
+        self._dirty = True # The screen is only redrawn when something has changed
+
+        # With enable_ai off, both sides are played by clicking
+        self.enable_ai = enable_ai
+        self.ai_color = ai_color
+        self.engine = None
+        if self.enable_ai:
+            from engine import Engine # Imported here so two-player games skip the AI's startup cost
+            self.engine = Engine()
+
+            # A single long-lived AI thread takes boards to search from _ai_in and posts its moves to _ai_out
+            self._ai_in = queue.Queue()
+            self._ai_out = queue.Queue()
+            threading.Thread(target=self._ai_worker, daemon=True).start()
+            self.request_ai_move()
 
         self.font = pygame.font.SysFont("Arial", 48, bold=True)
         self.small_font = pygame.font.SysFont("Arial", 24)
@@ -89,120 +117,114 @@ class ChessGUI:
                 return None
         return images
 
-    # --- NEW: AI Logic ---
-    def evaluate_board(self):
+    def _push(self, move):
         """
-        Evaluates the board based on material count.
-        Positive score means White is ahead, negative means Black is ahead.
+        Makes a move on the board and refreshes the caches of the position.
         """
-        score = 0
-        for square in chess.SQUARES:
-            piece = self.board.piece_at(square)
-            if piece:
-                value = PIECE_VALUES[piece.piece_type]
-                if piece.color == chess.WHITE:
-                    score += value
-                else:
-                    score -= value
-        return score
+        self.board.push(move)
+        self._legal_cache = None
+        self._piece_map = self.board.piece_map()
 
-    def find_best_move(self):
+    def _legal(self):
         """
-        Finds the best move for the AI player using a simple greedy algorithm.
+        Returns the legal moves of the current position, generating them once per position.
         """
-        best_move = None
-        legal_moves = list(self.board.legal_moves)
-        random.shuffle(legal_moves) # Introduce randomness for variety
-
-        if self.board.turn == chess.WHITE: # AI is White (Maximizing player)
-            max_eval = -float('inf')
-            for move in legal_moves:
-                self.board.push(move)
-                evaluation = self.evaluate_board()
-                self.board.pop()
-                if evaluation > max_eval:
-                    max_eval = evaluation
-                    best_move = move
-        else: # AI is Black (Minimizing player)
-            min_eval = float('inf')
-            for move in legal_moves:
-                self.board.push(move)
-                evaluation = self.evaluate_board()
-                self.board.pop()
-                if evaluation < min_eval:
-                    min_eval = evaluation
-                    best_move = move
-        
-        # If no move improves the situation, pick a random one
-        return best_move if best_move is not None else random.choice(legal_moves)
+        if self._legal_cache is None:
+            self._legal_cache = list(self.board.legal_moves)
+            self._legal_set = set(self._legal_cache)
+        return self._legal_cache
 
+    def _is_legal(self, move):
+        """
+        Checks a move against the cached legal moves of the current position.
+        """
+        self._legal()
+        return move in self._legal_set
 
-    def make_ai_move(self):
+    def _ai_worker(self):
         """
-        Calculates and performs the AI's move in a separate thread.
+        Runs on the AI thread: searches each board it is sent until it receives None.
         """
-        self.ai_is_thinking = True
-        time.sleep(AI_THINK_TIME) # A small delay to feel more natural
-        
-        move = self.find_best_move()
+        while True:
+            board = self._ai_in.get()
+            if board is None:
+                break
+            self._ai_out.put(self.make_ai_move(board))
 
+    def request_ai_move(self):
+        """
+        Sends the current position to the AI thread if it is the AI's turn.
+        """
+        if self.enable_ai and self.board.turn == self.ai_color and not self.board.is_game_over():
+            # The AI searches its own copy, so the board drawn here is never mutated mid-search
+            self._ai_in.put(self.board.copy(stack=False))
+
+    def make_ai_move(self, board):
+        """
+        Calculates the AI's move for board. Runs on the AI thread; the move is
+        applied to the game by apply_ai_move on the main thread.
+        """
+        start_time = time.time()
+
+        move = self.engine.search(board, AI_THINK_TIME)
+
+        # Searches that end early (e.g. a single legal reply) still wait out the minimum delay
+        elapsed = time.time() - start_time
+        if elapsed < MIN_UI_DELAY:
+            time.sleep(MIN_UI_DELAY - elapsed)
+        return move
+
+    def apply_ai_move(self, move):
+        """
+        Plays the move found by the AI thread on the game board.
+        """
         if move:
             # Play sound based on the move's outcome
             is_capture = self.board.is_capture(move)
-            self.board.push(move)
+            self._push(move)
             if self.board.is_check():
                 self.sounds['check'].play()
             elif is_capture:
                 self.sounds['capture'].play()
             else:
                 self.sounds['move'].play()
-        
-        self.ai_is_thinking = False
 
-    def draw_board(self):
+        self._dirty = True
+
+    def _build_board_bg(self):
+        """
+        Renders the checkerboard once; it never changes during the game.
+        """
+        board_bg = pygame.Surface((BOARD_WIDTH, BOARD_HEIGHT)).convert()
         for row in range(8):
             for col in range(8):
                 color = LIGHT_SQUARE if (row + col) % 2 == 0 else DARK_SQUARE
-                pygame.draw.rect(self.screen, color, 
-                                 (self.board_pos_x + col * SQUARE_SIZE, 
-                                  self.board_pos_y + row * SQUARE_SIZE, 
+                pygame.draw.rect(board_bg, color,
+                                 (col * SQUARE_SIZE, row * SQUARE_SIZE,
                                   SQUARE_SIZE, SQUARE_SIZE))
+        return board_bg
+
+    def draw_board(self):
+        self.screen.blit(self._board_bg, (self.board_pos_x, self.board_pos_y))
 
     def draw_pieces(self):
-        for square in chess.SQUARES:
-            piece = self.board.piece_at(square)
-            if piece:
-                row = 7 - (square // 8) 
-                col = square % 8
-                piece_img = self.piece_images[piece.symbol()]
-                x = self.board_pos_x + col * SQUARE_SIZE
-                y = self.board_pos_y + row * SQUARE_SIZE
-                self.screen.blit(piece_img, (x, y))
+        for square, piece in self._piece_map.items():
+            self.screen.blit(self.piece_images[piece.symbol()], self._square_xy[square])
 
     def draw_highlights(self):
         if self.selected_square is not None:
-            row = 7 - (self.selected_square // 8)
-            col = self.selected_square % 8
-            s = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
-            s.fill(SELECTED_COLOR)
-            self.screen.blit(s, (self.board_pos_x + col * SQUARE_SIZE, 
-                                 self.board_pos_y + row * SQUARE_SIZE))
+            self.screen.blit(self._sel_surface, self._square_xy[self.selected_square])
         
         for move in self.legal_moves:
-            dest_square = move.to_square
-            row = 7 - (dest_square // 8)
-            col = dest_square % 8
-            s = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
-            pygame.draw.circle(s, HIGHLIGHT_COLOR, (SQUARE_SIZE//2, SQUARE_SIZE//2), SQUARE_SIZE // 6)
-            self.screen.blit(s, (self.board_pos_x + col * SQUARE_SIZE, 
-                                 self.board_pos_y + row * SQUARE_SIZE))
+            self.screen.blit(self._dot_surface, self._square_xy[move.to_square])
 
     # --- MODIFIED: Handle clicks and trigger AI ---
     def handle_click(self, pos):
         # Do nothing if it's the AI's turn or the game is over
-        if self.board.turn == AI_PLAYER or self.board.is_game_over() or self.ai_is_thinking:
+        if (self.enable_ai and self.board.turn == self.ai_color) or self.board.is_game_over():
             return
 
+        self._dirty = True
         col = (pos[0] - self.board_pos_x) // SQUARE_SIZE
         row = (pos[1] - self.board_pos_y) // SQUARE_SIZE
         
@@ -219,9 +241,9 @@ class ChessGUI:
                 if chess.square_rank(square_index) in [0, 7]:
                     move.promotion = chess.QUEEN
 
-            if move in self.board.legal_moves:
+            if self._is_legal(move):
                 is_capture = self.board.is_capture(move)
-                self.board.push(move)
+                self._push(move)
                 
                 if self.board.is_check(): self.sounds['check'].play()
                 elif is_capture: self.sounds['capture'].play()
@@ -231,13 +253,11 @@ class ChessGUI:
                 self.legal_moves = []
 
                 # --- NEW: Trigger AI move after human move ---
-                if not self.board.is_game_over():
-                    ai_thread = threading.Thread(target=self.make_ai_move)
-                    ai_thread.start()
+                self.request_ai_move()
             
             elif self.board.piece_at(square_index) and self.board.piece_at(square_index).color == self.board.turn:
                 self.selected_square = square_index
-                self.legal_moves = [m for m in self.board.legal_moves if m.from_square == square_index]
+                self.legal_moves = [m for m in self._legal() if m.from_square == square_index]
             else:
                 self.selected_square = None
                 self.legal_moves = []
@@ -245,29 +265,33 @@ class ChessGUI:
             piece = self.board.piece_at(square_index)
             if piece and piece.color == self.board.turn:
                 self.selected_square = square_index
-                self.legal_moves = [m for m in self.board.legal_moves if m.from_square == square_index]
+                self.legal_moves = [m for m in self._legal() if m.from_square == square_index]
     
     def draw_game_over_message(self):
         outcome = self.board.outcome()
         if outcome:
-            overlay = pygame.Surface((BOARD_WIDTH, BOARD_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            self.screen.blit(overlay, (self.board_pos_x, self.board_pos_y))
-            
-            winner_text = ""
-            if outcome.winner is not None:
-                winner = "White" if outcome.winner == chess.WHITE else "Black"
-                winner_text = f"{winner} wins by {outcome.termination.name}!"
-            else:
-                winner_text = f"Draw by {outcome.termination.name}!"
-            
-            text_surface = self.font.render(winner_text, True, WHITE)
-            text_rect = text_surface.get_rect(center=(WIDTH / 2, HEIGHT / 2 - 20))
+            self.screen.blit(self._gameover_overlay, (self.board_pos_x, self.board_pos_y))
+
+            # Text is only rendered the first time this outcome is drawn
+            if self._gameover_cache is None or self._gameover_cache[0] != outcome:
+                winner_text = ""
+                if outcome.winner is not None:
+                    winner = "White" if outcome.winner == chess.WHITE else "Black"
+                    winner_text = f"{winner} wins by {outcome.termination.name}!"
+                else:
+                    winner_text = f"Draw by {outcome.termination.name}!"
+
+                text_surface = self.font.render(winner_text, True, WHITE)
+                text_rect = text_surface.get_rect(center=(WIDTH / 2, HEIGHT / 2 - 20))
+
+                restart_text = "Press 'R' to play again."
+                restart_surface = self.small_font.render(restart_text, True, WHITE)
+                restart_rect = restart_surface.get_rect(center=(WIDTH / 2, HEIGHT / 2 + 30))
+
+                self._gameover_cache = (outcome, text_surface, text_rect, restart_surface, restart_rect)
+
+            _, text_surface, text_rect, restart_surface, restart_rect = self._gameover_cache
             self.screen.blit(text_surface, text_rect)
-            
-            restart_text = "Press 'R' to play again."
-            restart_surface = self.small_font.render(restart_text, True, WHITE)
-            restart_rect = restart_surface.get_rect(center=(WIDTH / 2, HEIGHT / 2 + 30))
             self.screen.blit(restart_surface, restart_rect)
 
     def run(self):
@@ -283,20 +307,41 @@ class ChessGUI:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r and self.board.is_game_over():
                         self.board.reset()
+                        if self.engine is not None:
+                            self.engine.clear_tt()
+                        self._legal_cache = None
+                        self._piece_map = self.board.piece_map()
+                        self._gameover_cache = None
                         self.selected_square = None
                         self.legal_moves = []
-                        self.ai_is_thinking = False
+                        self._dirty = True
+                        self.request_ai_move()
 
-            self.screen.fill(BLACK)
-            self.draw_board()
-            self.draw_highlights()
-            self.draw_pieces()
-            
-            if self.board.is_game_over():
-                self.draw_game_over_message()
+                if event.type in EXPOSE_EVENTS:
+                    self._dirty = True
+
+            if self.enable_ai:
+                try:
+                    self.apply_ai_move(self._ai_out.get_nowait())
+                except queue.Empty:
+                    pass
+
+            if self._dirty:
+                self._dirty = False
+                self.screen.fill(BLACK)
+                self.draw_board()
+                self.draw_highlights()
+                self.draw_pieces()
+                
+                if self.board.is_game_over():
+                    self.draw_game_over_message()
+
+                pygame.display.flip()
 
-            pygame.display.flip()
+            self._clock.tick(FPS)
 
+        if self.enable_ai:
+            self._ai_in.put(None)
         pygame.quit()
         sys.exit()
 
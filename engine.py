@@ -0,0 +1,240 @@
+"""
+Search and evaluation for the chess AI.
+
+This module has no pygame dependency, so the engine can run on its own,
+for example under PyPy:
+
+% pypy engine.py "<FEN>" [seconds]
+"""
+
+import chess
+import sys
+import random
+import time
+import itertools
+
+# --- Search configuration ---
+MATE_SCORE = 1000 # Larger than any possible material difference
+TT_SIZE = 2 ** 16 # Slots in the transposition table; a new entry always replaces the old one
+
+# Transposition table entry flags
+EXACT = 0
+LOWERBOUND = 1
+UPPERBOUND = 2
+
+# --- Piece values for evaluation ---
+PIECE_VALUES = {
+    chess.PAWN: 1,
+    chess.KNIGHT: 3,
+    chess.BISHOP: 3,
+    chess.ROOK: 5,
+    chess.QUEEN: 9,
+    chess.KING: 0 # King value is infinite in reality, but 0 for material calculation
+}
+
+MATERIAL_PIECE_TYPES = (chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN)
+
+class Engine:
+    def __init__(self):
+        self.board = None
+        self.tt = [None] * TT_SIZE # Transposition table slots: (position key, depth, value, flag, best move)
+        self.material_score = 0 # Kept up to date by _push and _pop
+        self._material_stack = []
+
+    def clear_tt(self):
+        """
+        Empties the transposition table, e.g. when a new game starts.
+        """
+        self.tt = [None] * TT_SIZE
+
+    def count_material(self):
+        """
+        Counts the material on the board from scratch using bitboard popcounts.
+        Positive score means White is ahead, negative means Black is ahead.
+        """
+        score = 0
+        for piece_type in MATERIAL_PIECE_TYPES:
+            white = chess.popcount(self.board.pieces_mask(piece_type, chess.WHITE))
+            black = chess.popcount(self.board.pieces_mask(piece_type, chess.BLACK))
+            score += PIECE_VALUES[piece_type] * (white - black)
+        return score
+
+    def _push(self, move):
+        """
+        Makes a move on the board and updates the running material score.
+        """
+        delta = 0
+        if self.board.is_en_passant(move):
+            delta += PIECE_VALUES[chess.PAWN]
+        else:
+            captured = self.board.piece_type_at(move.to_square)
+            if captured:
+                delta += PIECE_VALUES[captured]
+        if move.promotion:
+            delta += PIECE_VALUES[move.promotion] - PIECE_VALUES[chess.PAWN]
+        if self.board.turn == chess.BLACK:
+            delta = -delta
+
+        self.board.push(move)
+        self.material_score += delta
+        self._material_stack.append(delta)
+
+    def _pop(self):
+        """
+        Takes back the last move made with _push.
+        """
+        self.board.pop()
+        self.material_score -= self._material_stack.pop()
+
+    def evaluate_board(self):
+        """
+        Evaluates the board based on material count.
+        Positive score means White is ahead, negative means Black is ahead.
+        """
+        return self.material_score
+
+    def order_moves(self, moves, first_move=None):
+        """
+        Sorts moves in place so the most promising are searched first:
+        first_move, then captures by MVV-LVA (most valuable victim, least
+        valuable attacker), then quiet moves in their original order.
+        """
+        def key(move):
+            if move == first_move:
+                return (2, 0)
+            if self.board.is_capture(move):
+                if self.board.is_en_passant(move):
+                    victim = chess.PAWN
+                else:
+                    victim = self.board.piece_type_at(move.to_square)
+                attacker = self.board.piece_type_at(move.from_square)
+                return (1, PIECE_VALUES[victim] * 10 - PIECE_VALUES[attacker])
+            return (0, 0)
+
+        moves.sort(key=key, reverse=True)
+
+    def negamax(self, depth, alpha, beta, color, deadline=None):
+        """
+        Searches the current position with negamax and alpha-beta pruning.
+        Returns the score from the point of view of the side to move,
+        where color is 1 for White to move and -1 for Black to move.
+        Raises TimeoutError once the deadline has passed.
+        """
+        if deadline is not None and time.time() >= deadline:
+            raise TimeoutError
+
+        if depth == 0:
+            # Only look for one legal move to tell checkmate or stalemate from a quiet leaf
+            if not any(self.board.generate_legal_moves()):
+                return -MATE_SCORE if self.board.is_check() else 0
+            return color * self.evaluate_board()
+
+        alpha_orig = alpha
+        key = self.board._transposition_key()
+        index = hash(key) % TT_SIZE
+        entry = self.tt[index]
+        if entry is not None and entry[0] != key:
+            entry = None # The slot holds a different position
+        tt_move = None
+        if entry is not None:
+            tt_move = entry[4]
+        if entry is not None and entry[1] >= depth:
+            _, _, tt_value, tt_flag, _ = entry
+            if tt_flag == EXACT:
+                return tt_value
+            elif tt_flag == LOWERBOUND:
+                alpha = max(alpha, tt_value)
+            else:
+                beta = min(beta, tt_value)
+            if alpha >= beta:
+                return tt_value
+
+        legal_moves = list(self.board.legal_moves)
+        if not legal_moves:
+            # Checkmate or stalemate; prefer quicker mates by rewarding remaining depth
+            return -(MATE_SCORE + depth) if self.board.is_check() else 0
+
+        self.order_moves(legal_moves, tt_move)
+        best_move = None
+        for move in legal_moves:
+            self._push(move)
+            value = -self.negamax(depth - 1, -beta, -alpha, -color, deadline)
+            self._pop()
+            if value >= beta:
+                alpha = beta
+                best_move = move
+                break
+            if value > alpha:
+                alpha = value
+                best_move = move
+
+        if alpha <= alpha_orig:
+            flag = UPPERBOUND
+        elif alpha >= beta:
+            flag = LOWERBOUND
+        else:
+            flag = EXACT
+        self.tt[index] = (key, depth, alpha, flag, best_move or tt_move)
+        return alpha
+
+    def find_best_move(self, depth, deadline=None, first_move=None):
+        """
+        Finds the best move for the AI player using a fixed-depth alpha-beta search.
+        first_move, usually the best move of the previous iteration, is searched first.
+        """
+        best_move = None
+        best_value = -float('inf')
+        alpha = -float('inf')
+        beta = float('inf')
+        color = 1 if self.board.turn == chess.WHITE else -1
+
+        legal_moves = list(self.board.legal_moves)
+        random.shuffle(legal_moves) # Introduce randomness for variety among equal moves
+        self.order_moves(legal_moves, first_move) # The sort is stable, so the shuffle survives ties
+
+        for move in legal_moves:
+            self._push(move)
+            value = -self.negamax(depth - 1, -beta, -alpha, -color, deadline)
+            self._pop()
+            if value > best_value:
+                best_value = value
+                best_move = move
+            if value > alpha:
+                alpha = value
+
+        return best_move
+
+    def search(self, board, think_time):
+        """
+        Searches board with iterative deepening for up to think_time seconds and
+        returns the best move found, or None if there are no legal moves.
+        The board is left in the position it was given.
+        """
+        self.board = board
+        self.material_score = self.count_material()
+        self._material_stack = []
+
+        # Iterative deepening: keep the best move of the last fully searched depth
+        deadline = time.time() + think_time
+        ply = len(self.board.move_stack)
+        move = None
+        for depth in itertools.count(1):
+            try:
+                move = self.find_best_move(depth, deadline, move)
+            except TimeoutError:
+                # Undo the moves left on the board by the interrupted search
+                while len(self.board.move_stack) > ply:
+                    self._pop()
+                break
+            if time.time() >= deadline or self.board.legal_moves.count() <= 1:
+                break
+
+        if move is None and not self.board.is_game_over():
+            move = random.choice(list(self.board.legal_moves))
+        return move
+
+if __name__ == "__main__":
+    fen = sys.argv[1] if len(sys.argv) > 1 else chess.STARTING_FEN
+    think_time = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    move = Engine().search(chess.Board(fen), think_time)
+    print(move.uci() if move else "(none)")